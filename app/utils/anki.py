@@ -4,8 +4,9 @@ import os
 import logging
 from gtts import gTTS
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Tuple
 import pandas as pd
+from app.utils.packager import StreamingApkgPackager
 
 class AnkiDeckGenerator:
     def __init__(self, temp_dir="app/data/temp"):
@@ -131,6 +132,36 @@ class AnkiDeckGenerator:
             self.logger.error(f"Error creating audio files: {str(e)}")
             raise
 
+    def _iter_note_fields(self, df: pd.DataFrame, audio_files: List[str],
+                          register_audio: Callable[[str], str]) -> Iterator[List[str]]:
+        """
+        Ubah setiap baris DataFrame menjadi isi field note
+        
+        Args:
+            df (pd.DataFrame): DataFrame dengan kolom 'word', 'translation', dan 'context'
+            audio_files (List[str]): List path file audio
+            register_audio (Callable[[str], str]): Dipanggil untuk setiap file audio yang ada,
+                mengembalikan nama file yang dipakai di field [sound:...]
+            
+        Yields:
+            List[str]: Isi field sesuai urutan field pada model
+        """
+        for i, (_, row) in enumerate(df.iterrows()):
+            audio_path = audio_files[i] if i < len(audio_files) else ""
+            
+            if audio_path and os.path.exists(audio_path):
+                audio_field = f'[sound:{register_audio(audio_path)}]'
+            else:
+                audio_field = ''
+
+            yield [
+                row['word'],
+                row.get('translation', ''),
+                row.get('context', ''),
+                audio_field
+            ]
+            self.logger.info(f"Added note for word: {row['word']}")
+
     def generate_deck(self, df: pd.DataFrame, audio_files: List[str]) -> str:
         """
         Generate deck Anki dari DataFrame dan file audio
@@ -148,27 +179,13 @@ class AnkiDeckGenerator:
             
             # Tambahkan notes
             valid_audio_files = []
-            for i, (_, row) in enumerate(df.iterrows()):
-                audio_path = audio_files[i] if i < len(audio_files) else ""
-                
-                if audio_path and os.path.exists(audio_path):
-                    audio_filename = os.path.basename(audio_path)
-                    audio_field = f'[sound:{audio_filename}]'
-                    valid_audio_files.append(audio_path)
-                else:
-                    audio_field = ''
 
-                note = genanki.Note(
-                    model=self.model,
-                    fields=[
-                        row['word'],
-                        row.get('translation', ''),
-                        row.get('context', ''),
-                        audio_field
-                    ]
-                )
-                deck.add_note(note)
-                self.logger.info(f"Added note for word: {row['word']}")
+            def register_audio(audio_path):
+                valid_audio_files.append(audio_path)
+                return os.path.basename(audio_path)
+
+            for fields in self._iter_note_fields(df, audio_files, register_audio):
+                deck.add_note(genanki.Note(model=self.model, fields=fields))
 
             # Buat dan simpan package
             package = genanki.Package(deck)
@@ -185,6 +202,43 @@ class AnkiDeckGenerator:
             self.logger.error(f"Error generating deck: {str(e)}")
             raise
 
+    def generate_deck_streaming(self, df: pd.DataFrame, audio_files: List[str],
+                                compact_audio: bool = False) -> Dict:
+        """
+        Generate deck Anki secara streaming, dengan dedupe media dan audio yang lebih kecil
+        
+        Args:
+            df (pd.DataFrame): DataFrame dengan kolom 'word', 'translation', dan 'context'
+            audio_files (List[str]): List path file audio
+            compact_audio (bool): Encode ulang audio menjadi MP3 mono bitrate rendah
+                (default mati, klip gTTS sudah MP3 mono bitrate rendah)
+            
+        Returns:
+            Dict: Laporan package, termasuk 'output_path', 'package_size' dan 'build_time'
+        """
+        try:
+            output_path = self.temp_dir / 'japanese_vocabulary.apkg'
+            packager = StreamingApkgPackager(
+                self.deck_id,
+                'Japanese Vocabulary from Text',
+                self.model,
+                output_path,
+                temp_dir=str(self.temp_dir),
+                compact_audio=compact_audio
+            )
+
+            with packager:
+                for fields in self._iter_note_fields(df, audio_files, packager.add_media):
+                    packager.add_note(fields)
+
+            report = packager.report
+            self.logger.info(f"Successfully generated Anki deck at: {report['output_path']}")
+            return report
+            
+        except Exception as e:
+            self.logger.error(f"Error generating deck: {str(e)}")
+            raise
+
     def cleanup(self):
         """Bersihkan file audio temporary"""
         try:
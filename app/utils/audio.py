@@ -5,10 +5,12 @@ import logging
 import warnings
 import torch
 import shutil
+import subprocess
 import tempfile
 from datetime import datetime
 import random
 from pathlib import Path
+from yt_dlp.utils import download_range_func
 
 # Mematikan warning yang tidak diperlukan
 warnings.filterwarnings("ignore", category=UserWarning, module="torch.nn.modules.lazy")
@@ -54,6 +56,29 @@ class AudioProcessor:
         filename = f"{prefix}{timestamp}_{random_suffix}{suffix}"
         return self.temp_dir / filename
 
+    def _validate_time_range(self, start_time=None, end_time=None):
+        """
+        Validasi batas waktu (dalam detik) untuk pemrosesan sebagian media
+
+        Args:
+            start_time (float, optional): Detik awal, None berarti dari awal media
+            end_time (float, optional): Detik akhir, None berarti sampai akhir media
+
+        Returns:
+            tuple: (start_time, end_time) dalam bentuk float atau None
+        """
+        if start_time is not None:
+            start_time = float(start_time)
+            if start_time < 0:
+                raise ValueError(f"start_time must be >= 0, got {start_time}")
+        if end_time is not None:
+            end_time = float(end_time)
+            if end_time <= (start_time or 0.0):
+                raise ValueError(
+                    f"end_time ({end_time}) must be greater than start_time ({start_time or 0.0})"
+                )
+        return start_time, end_time
+
     def setup_whisper_model(self, model_type):
         """
         Setup model Whisper
@@ -70,17 +95,20 @@ class AudioProcessor:
             self.logger.error(f"Error loading Whisper model: {str(e)}")
             raise
 
-    def download_youtube_audio(self, url):
+    def download_youtube_audio(self, url, start_time=None, end_time=None):
         """
         Download audio dari YouTube URL
         
         Args:
             url (str): YouTube URL
+            start_time (float, optional): Detik awal bagian yang didownload
+            end_time (float, optional): Detik akhir bagian yang didownload
             
         Returns:
             Path: Path ke file audio yang didownload
         """
         try:
+            start_time, end_time = self._validate_time_range(start_time, end_time)
             output_path = self._generate_temp_filename()
             self.logger.info(f"Downloading audio to: {output_path}")
 
@@ -96,6 +124,15 @@ class AudioProcessor:
                 'no_warnings': True,
                 'nocheckcertificate': True
             }
+
+            # Hanya download bagian yang diminta (yt-dlp memakai ffmpeg untuk memotong stream).
+            # Tanpa force_keyframes_at_cuts: frame audio bisa didecode sendiri-sendiri, jadi
+            # potongan stream-copy sudah akurat dan hanya ada satu encode (FFmpegExtractAudio)
+            if start_time is not None or end_time is not None:
+                section_start = start_time or 0.0
+                section_end = end_time if end_time is not None else float('inf')
+                self.logger.info(f"Downloading section: {section_start}s - {section_end}s")
+                ydl_opts['download_ranges'] = download_range_func(None, [(section_start, section_end)])
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
@@ -110,13 +147,59 @@ class AudioProcessor:
             self.logger.error(f"Download failed: {str(e)}")
             raise
 
-    def transcribe_audio(self, audio_path, language="ja"):
+    def extract_audio_segment(self, file_path, start_time=None, end_time=None):
+        """
+        Potong bagian audio dengan ffmpeg (seek langsung ke start_time tanpa decode dari awal)
+        
+        Args:
+            file_path (Union[str, Path]): Path ke file audio/video sumber
+            start_time (float, optional): Detik awal potongan
+            end_time (float, optional): Detik akhir potongan
+            
+        Returns:
+            Path: Path ke file WAV temporary berisi potongan audio
+        """
+        try:
+            file_path = Path(file_path)
+            if not file_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+            start_time, end_time = self._validate_time_range(start_time, end_time)
+            output_path = self._generate_temp_filename(suffix=".wav")
+            self.logger.info(f"Extracting {start_time or 0.0}s - {end_time}s from {file_path}")
+
+            cmd = ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y']
+            # -ss sebelum -i: input seeking, ffmpeg melompat langsung ke posisi awal
+            if start_time:
+                cmd += ['-ss', str(start_time)]
+            if end_time is not None:
+                cmd += ['-t', str(end_time - (start_time or 0.0))]
+            # Output mono 16 kHz, format yang dipakai Whisper secara internal
+            cmd += ['-i', str(file_path), '-vn', '-ac', '1', '-ar', '16000', str(output_path)]
+
+            subprocess.run(cmd, check=True, capture_output=True)
+
+            if not output_path.exists():
+                raise FileNotFoundError(f"Extracted file not found at {output_path}")
+
+            return output_path
+
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"ffmpeg failed: {e.stderr.decode(errors='ignore')}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Audio extraction failed: {str(e)}")
+            raise
+
+    def transcribe_audio(self, audio_path, language="ja", time_offset=0.0):
         """
         Transkripsi audio menggunakan Whisper
         
         Args:
             audio_path (Union[str, Path]): Path ke file audio
             language (str): Kode bahasa (default: 'ja' untuk Jepang)
+            time_offset (float): Detik yang ditambahkan ke timestamp segmen, dipakai
+                jika audio merupakan potongan dari media asli
             
         Returns:
             list: List dari segmen transkripsi
@@ -137,8 +220,8 @@ class AudioProcessor:
             segments = []
             for segment in result["segments"]:
                 segments.append({
-                    'start': segment['start'],
-                    'end': segment['end'],
+                    'start': segment['start'] + time_offset,
+                    'end': segment['end'] + time_offset,
                     'text': segment['text'].strip()
                 })
             
@@ -149,13 +232,15 @@ class AudioProcessor:
             self.logger.error(f"Transcription failed: {str(e)}")
             raise
 
-    def process_youtube_url(self, url, language="ja"):
+    def process_youtube_url(self, url, language="ja", start_time=None, end_time=None):
         """
         Proses YouTube URL: download dan transkripsi
         
         Args:
             url (str): YouTube URL
             language (str): Kode bahasa untuk transkripsi
+            start_time (float, optional): Detik awal bagian video yang diproses
+            end_time (float, optional): Detik akhir bagian video yang diproses
             
         Returns:
             list: List dari segmen transkripsi
@@ -164,12 +249,12 @@ class AudioProcessor:
         try:
             self.logger.info(f"Processing YouTube URL: {url}")
             
-            # Download audio
-            audio_path = self.download_youtube_audio(url)
+            # Download audio (hanya bagian yang diminta jika ada batas waktu)
+            audio_path = self.download_youtube_audio(url, start_time, end_time)
             self.logger.info(f"Audio downloaded to: {audio_path}")
             
-            # Transkripsi audio
-            segments = self.transcribe_audio(audio_path, language)
+            # Transkripsi audio, timestamp relatif terhadap video asli
+            segments = self.transcribe_audio(audio_path, language, time_offset=float(start_time or 0.0))
             
             return segments
             
@@ -185,24 +270,41 @@ class AudioProcessor:
                 except Exception as e:
                     self.logger.warning(f"Failed to cleanup temporary file: {str(e)}")
 
-    def process_audio_file(self, file_path, language="ja"):
+    def process_audio_file(self, file_path, language="ja", start_time=None, end_time=None):
         """
         Proses file audio yang sudah ada
         
         Args:
             file_path (Union[str, Path]): Path ke file audio
             language (str): Kode bahasa untuk transkripsi
+            start_time (float, optional): Detik awal bagian audio yang diproses
+            end_time (float, optional): Detik akhir bagian audio yang diproses
             
         Returns:
             list: List dari segmen transkripsi
         """
+        clip_path = None
         try:
             file_path = Path(file_path)
             self.logger.info(f"Processing audio file: {file_path}")
-            return self.transcribe_audio(file_path, language)
+
+            if start_time is None and end_time is None:
+                return self.transcribe_audio(file_path, language)
+
+            # Potong bagian yang diminta, timestamp relatif terhadap file asli
+            clip_path = self.extract_audio_segment(file_path, start_time, end_time)
+            return self.transcribe_audio(clip_path, language, time_offset=float(start_time or 0.0))
         except Exception as e:
             self.logger.error(f"Error processing audio file: {str(e)}")
             raise
+        finally:
+            # Cleanup potongan audio temporary
+            if clip_path and clip_path.exists():
+                try:
+                    clip_path.unlink()
+                    self.logger.info(f"Cleaned up temporary audio file: {clip_path}")
+                except Exception as e:
+                    self.logger.warning(f"Failed to cleanup temporary file: {str(e)}")
 
     def cleanup_temp_files(self):
         """Membersihkan file temporary"""
@@ -0,0 +1,324 @@
+# app/utils/packager.py
+
+import genanki
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+from genanki.apkg_col import APKG_COL
+from genanki.apkg_schema import APKG_SCHEMA
+
+class StreamingApkgPackager:
+    def __init__(self, deck_id: int, deck_name: str, model: genanki.Model, output_path,
+                 temp_dir="app/data/temp", compact_audio: bool = True,
+                 audio_bitrate: str = "32k", audio_sample_rate: int = 22050,
+                 commit_every: int = 500):
+        """
+        Inisialisasi StreamingApkgPackager
+
+        Notes ditulis langsung ke database SQLite dan media langsung ke arsip zip,
+        sehingga isi deck tidak perlu ditahan seluruhnya di memori.
+
+        Args:
+            deck_id (int): ID deck Anki
+            deck_name (str): Nama deck Anki
+            model (genanki.Model): Model untuk kartu Anki
+            output_path (Union[str, Path]): Path file .apkg yang akan dibuat; file lama
+                baru diganti setelah package selesai ditulis
+            temp_dir (str): Path ke direktori temporary untuk database dan hasil encode audio
+            compact_audio (bool): Encode ulang audio menjadi MP3 mono bitrate rendah jika
+                hasilnya lebih kecil dari file asli
+            audio_bitrate (str): Bitrate audio hasil encode ulang (format ffmpeg, mis. '32k')
+            audio_sample_rate (int): Sample rate audio hasil encode ulang
+            commit_every (int): Jumlah notes sebelum commit ke database
+        """
+        self.logger = logging.getLogger(__name__)
+        self.deck_id = deck_id
+        self.deck_name = deck_name
+        self.model = model
+        self.output_path = Path(output_path)
+        self.temp_dir = Path(temp_dir)
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_audio = compact_audio
+        self.audio_bitrate = audio_bitrate
+        self.audio_sample_rate = audio_sample_rate
+        self.commit_every = commit_every
+
+        self._conn = None
+        self._cursor = None
+        self._zip = None
+        self._db_path = None
+        self._tmp_output_path = None
+        self._timestamp = None
+        self._id_gen = None
+        self._start_time = None
+
+        # Media yang sudah ditulis: hash konten -> nama file di dalam deck
+        self._media_by_hash: Dict[str, str] = {}
+        self._media_names: List[str] = []
+
+        self.stats = {}
+        self.report = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def open(self):
+        """Buat database collection dan arsip .apkg, lalu tulis metadata deck dan model"""
+        try:
+            self._start_time = time.perf_counter()
+            self.stats = {
+                'note_count': 0,
+                'media_count': 0,
+                'duplicate_media': 0,
+                'media_bytes_in': 0,
+                'media_bytes_out': 0,
+            }
+
+            dbfile, dbfilename = tempfile.mkstemp(suffix=".anki2", dir=str(self.temp_dir))
+            os.close(dbfile)
+            self._db_path = Path(dbfilename)
+            self._conn = sqlite3.connect(dbfilename)
+            self._cursor = self._conn.cursor()
+
+            self._timestamp = time.time()
+            self._id_gen = itertools.count(int(self._timestamp * 1000))
+
+            self._cursor.executescript(APKG_SCHEMA)
+            self._cursor.executescript(APKG_COL)
+
+            # Deck kosong hanya untuk menulis metadata deck dan model ke tabel col,
+            # notes ditulis satu per satu lewat add_note
+            deck = genanki.Deck(self.deck_id, self.deck_name)
+            deck.add_model(self.model)
+            deck.write_to_db(self._cursor, self._timestamp, self._id_gen)
+
+            # Tulis ke file temporary di direktori yang sama, deck lama tetap utuh
+            # sampai package baru selesai dan dipindahkan di close()
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            outfile, outfilename = tempfile.mkstemp(
+                prefix=f".{self.output_path.stem}_", suffix=".apkg.tmp", dir=str(self.output_path.parent)
+            )
+            os.close(outfile)
+            self._tmp_output_path = Path(outfilename)
+            self._zip = zipfile.ZipFile(outfilename, 'w')
+            self.logger.info(f"Opened streaming package for: {self.output_path}")
+
+        except Exception as e:
+            self.logger.error(f"Error opening package: {str(e)}")
+            self.abort()
+            raise
+
+    def _hash_file(self, path: Path) -> str:
+        """Hitung SHA-1 dari isi file secara bertahap"""
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _bitrate_bps(self) -> int:
+        """Ubah audio_bitrate format ffmpeg (mis. '32k') menjadi bit per detik"""
+        bitrate = str(self.audio_bitrate).strip().lower()
+        if bitrate.endswith('k'):
+            return int(float(bitrate[:-1]) * 1000)
+        return int(float(bitrate))
+
+    def _is_already_compact(self, source: Path) -> bool:
+        """
+        Cek dengan ffprobe apakah audio sudah mono dengan bitrate <= target
+
+        Returns:
+            bool: True jika encode ulang tidak diperlukan
+        """
+        cmd = [
+            'ffprobe', '-v', 'error', '-select_streams', 'a:0',
+            '-show_entries', 'stream=channels,bit_rate:format=bit_rate',
+            '-of', 'json', str(source)
+        ]
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True)
+            info = json.loads(result.stdout or b'{}')
+            streams = info.get('streams') or [{}]
+            channels = int(streams[0].get('channels', 0))
+            bit_rate = streams[0].get('bit_rate') or info.get('format', {}).get('bit_rate')
+            if channels != 1 or not bit_rate:
+                return False
+            return int(bit_rate) <= self._bitrate_bps()
+        except (subprocess.CalledProcessError, FileNotFoundError, ValueError) as e:
+            self.logger.warning(f"Failed to probe {source}: {str(e)}")
+            return False
+
+    def _encode_compact(self, source: Path, target: Path) -> bool:
+        """
+        Encode ulang audio menjadi MP3 mono bitrate rendah dengan ffmpeg
+
+        Returns:
+            bool: True jika encode berhasil
+        """
+        cmd = [
+            'ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+            '-i', str(source),
+            '-vn', '-ac', '1', '-ar', str(self.audio_sample_rate),
+            '-codec:a', 'libmp3lame', '-b:a', self.audio_bitrate,
+            str(target)
+        ]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True)
+            return target.exists() and target.stat().st_size > 0
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            self.logger.warning(f"Failed to re-encode {source}, storing original: {str(e)}")
+            return False
+
+    def add_media(self, media_path) -> str:
+        """
+        Tambahkan file media ke arsip, dengan dedupe berdasarkan hash konten
+
+        Args:
+            media_path (Union[str, Path]): Path ke file media
+
+        Returns:
+            str: Nama file media di dalam deck (dipakai untuk field [sound:...])
+        """
+        media_path = Path(media_path)
+        content_hash = self._hash_file(media_path)
+
+        if content_hash in self._media_by_hash:
+            self.stats['duplicate_media'] += 1
+            return self._media_by_hash[content_hash]
+
+        source_size = media_path.stat().st_size
+        encoded_path = None
+        stored_path = media_path
+        suffix = media_path.suffix
+
+        # Encode ulang hanya jika sumber belum mono bitrate rendah (mis. klip gTTS),
+        # dan hasilnya hanya dipakai jika benar-benar lebih kecil
+        if self.compact_audio and not self._is_already_compact(media_path):
+            # Nama unik per encode agar session lain yang memakai klip yang sama tidak bentrok;
+            # hash konten hanya dipakai untuk nama media di dalam deck
+            encfile, encfilename = tempfile.mkstemp(prefix="packed_", suffix=".mp3", dir=str(self.temp_dir))
+            os.close(encfile)
+            encoded_path = Path(encfilename)
+            if self._encode_compact(media_path, encoded_path):
+                if encoded_path.stat().st_size < source_size:
+                    stored_path = encoded_path
+                    suffix = ".mp3"
+                else:
+                    self.logger.info(f"Re-encoded {media_path} is not smaller, storing original")
+
+        # Nama file berdasarkan hash agar konten yang sama selalu memakai nama yang sama
+        media_name = f"{content_hash[:16]}{suffix}"
+        try:
+            # Anki memakai index sebagai nama entri media di dalam arsip
+            self._zip.write(str(stored_path), str(len(self._media_names)))
+            self.stats['media_bytes_in'] += source_size
+            self.stats['media_bytes_out'] += stored_path.stat().st_size
+        finally:
+            if encoded_path and encoded_path.exists():
+                encoded_path.unlink()
+
+        self._media_names.append(media_name)
+        self._media_by_hash[content_hash] = media_name
+        self.stats['media_count'] += 1
+        return media_name
+
+    def add_note(self, fields: List[str]):
+        """
+        Tulis satu note langsung ke database collection
+
+        Args:
+            fields (List[str]): Isi field sesuai urutan field pada model
+        """
+        note = genanki.Note(model=self.model, fields=fields)
+        note.write_to_db(self._cursor, self._timestamp, self.deck_id, self._id_gen)
+        self.stats['note_count'] += 1
+
+        if self.stats['note_count'] % self.commit_every == 0:
+            self._conn.commit()
+
+    def close(self) -> Dict:
+        """
+        Selesaikan package: tulis database dan daftar media ke arsip
+
+        Returns:
+            Dict: Laporan package (path, ukuran, waktu build, jumlah notes dan media),
+                juga disimpan di atribut report
+        """
+        try:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+            # Database berisi teks, jadi dikompres; media (MP3) disimpan apa adanya
+            self._zip.write(str(self._db_path), 'collection.anki2', compress_type=zipfile.ZIP_DEFLATED)
+            media_json = {str(idx): name for idx, name in enumerate(self._media_names)}
+            self._zip.writestr('media', json.dumps(media_json))
+            self._zip.close()
+            self._zip = None
+
+            os.replace(str(self._tmp_output_path), str(self.output_path))
+            self._tmp_output_path = None
+
+            report = dict(self.stats)
+            report['output_path'] = str(self.output_path)
+            report['package_size'] = self.output_path.stat().st_size
+            report['build_time'] = time.perf_counter() - self._start_time
+
+            self.report = report
+            self.logger.info(
+                f"Package written to {report['output_path']}: "
+                f"{report['package_size']} bytes, {report['note_count']} notes, "
+                f"{report['media_count']} media ({report['duplicate_media']} duplicates skipped) "
+                f"in {report['build_time']:.2f}s"
+            )
+            return report
+
+        except Exception as e:
+            self.logger.error(f"Error finalizing package: {str(e)}")
+            self.abort()
+            raise
+        finally:
+            self._cleanup_db()
+
+    def abort(self):
+        """Batalkan package dan hapus file temporary yang belum selesai, deck lama tidak disentuh"""
+        try:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+            if self._tmp_output_path and self._tmp_output_path.exists():
+                self._tmp_output_path.unlink()
+            self._tmp_output_path = None
+        except Exception as e:
+            self.logger.warning(f"Error aborting package: {str(e)}")
+        finally:
+            self._cleanup_db()
+
+    def _cleanup_db(self):
+        """Hapus database collection temporary"""
+        if self._db_path and self._db_path.exists():
+            try:
+                self._db_path.unlink()
+            except Exception as e:
+                self.logger.warning(f"Failed to remove temporary database {self._db_path}: {str(e)}")
+        self._db_path = None
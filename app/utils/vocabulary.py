@@ -2,17 +2,212 @@
 
 from sudachipy import dictionary, tokenizer
 import logging
-from typing import List, Dict
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
+
+SPLIT_MODE = tokenizer.Tokenizer.SplitMode.C  # Mode paling detail
+
+# Jenis kata yang bukan kata bermakna
+SKIPPED_POS = frozenset(['補助記号', '助詞', '助動詞'])
+
+# Di bawah jumlah karakter ini, batch diproses di process sendiri. Tokenisasi
+# in-process sekitar 400 ribu karakter/detik per core, sedangkan start worker
+# (spawn + load dictionary Sudachi) sekitar 0.3-0.4 detik per worker dari script
+# biasa ditambah overhead pickling hasil, jadi process pool baru menguntungkan
+# untuk ~1 juta karakter (~2.5 detik in-process). Angka ini tidak berlaku jika
+# worker harus mengimport ulang main module yang berat (lihat _running_in_streamlit)
+MIN_PARALLEL_CHARS = 1_000_000
+
+# Tokenizer milik masing-masing worker process, dibuat oleh _init_worker
+_worker_tokenizer = None
+
+
+def _token_to_word_info(token) -> Optional[Dict[str, str]]:
+    """
+    Ubah token Sudachi menjadi dictionary kosakata
+
+    Returns:
+        Optional[Dict[str, str]]: Informasi kosakata, atau None jika token dilewati
+    """
+    # part_of_speech() cukup dipanggil sekali per token
+    pos = token.part_of_speech()[0]
+    if pos in SKIPPED_POS:
+        return None
+
+    word_info = {
+        'surface': token.surface(),  # Bentuk yang muncul di teks
+        'base': token.dictionary_form(),  # Bentuk dasar kata
+        'pos': pos,  # Jenis kata
+        'reading': token.reading_form()  # Cara baca
+    }
+
+    # Hanya kembalikan kata yang memiliki bentuk dasar
+    if word_info['base'] and word_info['surface']:
+        return word_info
+    return None
+
+
+def _extract_with_tokenizer(tokenizer_obj, text: str) -> Tuple[List[Dict[str, str]], int]:
+    """
+    Ekstrak kosakata dari satu teks dengan tokenizer yang diberikan
+
+    Returns:
+        Tuple[List[Dict[str, str]], int]: List kosakata dan jumlah token
+    """
+    vocabulary = []
+    tokens = tokenizer_obj.tokenize(text, SPLIT_MODE)
+    for token in tokens:
+        word_info = _token_to_word_info(token)
+        if word_info is not None:
+            vocabulary.append(word_info)
+    return vocabulary, len(tokens)
+
+
+def _available_cpus() -> int:
+    """Jumlah core yang boleh dipakai process ini (memperhitungkan CPU affinity)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _running_in_streamlit() -> bool:
+    """
+    Cek apakah dipanggil dari dalam aplikasi Streamlit
+
+    Worker 'spawn' menjalankan ulang main module sebagai __mp_main__; di Streamlit itu
+    berarti main.py beserta streamlit, torch dan Whisper ikut diimport di setiap worker.
+    """
+    if 'streamlit' not in sys.modules:
+        return False
+    try:
+        from streamlit import runtime
+        return runtime.exists()
+    except Exception:
+        return False
+
+
+def _init_worker():
+    """Initializer untuk worker process: buat satu tokenizer per process"""
+    global _worker_tokenizer
+    _worker_tokenizer = dictionary.Dictionary().create()
+
+
+def _extract_in_worker(text: str) -> Tuple[List[Dict[str, str]], int]:
+    """Ekstrak kosakata di dalam worker process"""
+    return _extract_with_tokenizer(_worker_tokenizer, text)
+
+
+class TokenizerPool:
+    def __init__(self, max_size: int = 4):
+        """
+        Inisialisasi pool tokenizer Sudachi
+
+        Tokenizer Sudachi tidak aman dipakai bersama antar thread, jadi setiap thread
+        meminjam tokenizer sendiri dari pool. Dictionary dipakai bersama, tokenizer
+        dibuat saat dibutuhkan sampai max_size.
+
+        Args:
+            max_size (int): Jumlah maksimum tokenizer di dalam pool
+        """
+        if max_size < 1:
+            raise ValueError(f"max_size must be >= 1, got {max_size}")
+
+        self.logger = logging.getLogger(__name__)
+        self.max_size = max_size
+        self._dictionary = dictionary.Dictionary()
+        self._available = queue.LifoQueue()
+        # Tokenizer yang sedang dipinjam: id -> tokenizer
+        self._checked_out = {}
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def checkout(self, timeout: Optional[float] = None):
+        """
+        Pinjam tokenizer dari pool
+
+        Args:
+            timeout (float, optional): Detik maksimum menunggu tokenizer tersedia,
+                None berarti menunggu tanpa batas
+
+        Returns:
+            Tokenizer: Tokenizer Sudachi yang hanya boleh dipakai oleh peminjam
+        """
+        try:
+            return self._mark_checked_out(self._available.get_nowait())
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create_new = True
+            else:
+                create_new = False
+
+        if create_new:
+            try:
+                return self._mark_checked_out(self._dictionary.create())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._mark_checked_out(self._available.get(timeout=timeout))
+        except queue.Empty:
+            raise TimeoutError(f"No tokenizer available after {timeout}s (pool size {self.max_size})")
+
+    def _mark_checked_out(self, tokenizer_obj):
+        """Catat tokenizer sebagai sedang dipinjam"""
+        with self._lock:
+            self._checked_out[id(tokenizer_obj)] = tokenizer_obj
+        return tokenizer_obj
+
+    def checkin(self, tokenizer_obj):
+        """
+        Kembalikan tokenizer ke pool
+
+        Args:
+            tokenizer_obj (Tokenizer): Tokenizer yang sebelumnya dipinjam lewat checkout
+
+        Raises:
+            ValueError: Jika tokenizer tidak sedang dipinjam dari pool ini
+                (checkin dua kali atau tokenizer dari luar pool)
+        """
+        with self._lock:
+            if self._checked_out.pop(id(tokenizer_obj), None) is None:
+                raise ValueError("Tokenizer was not checked out from this pool")
+        self._available.put(tokenizer_obj)
+
+    @contextmanager
+    def tokenizer(self, timeout: Optional[float] = None):
+        """Context manager untuk checkout dan checkin tokenizer"""
+        tokenizer_obj = self.checkout(timeout)
+        try:
+            yield tokenizer_obj
+        finally:
+            self.checkin(tokenizer_obj)
+
 
 class VocabularyProcessor:
-    def __init__(self):
+    def __init__(self, pool_size: int = 4):
         """
         Inisialisasi VocabularyProcessor dengan Sudachi tokenizer
+        
+        Args:
+            pool_size (int): Jumlah maksimum tokenizer untuk pemakaian dari banyak thread
         """
         self.logger = logging.getLogger(__name__)
         try:
-            self.tokenizer_obj = dictionary.Dictionary().create()
-            self.mode = tokenizer.Tokenizer.SplitMode.C  # Mode paling detail
+            self.pool = TokenizerPool(max_size=pool_size)
+            self.mode = SPLIT_MODE
         except Exception as e:
             self.logger.error(f"Error initializing Sudachi: {str(e)}")
             raise
@@ -28,24 +223,8 @@ class VocabularyProcessor:
             List[Dict[str, str]]: List dari dictionary berisi informasi kosakata
         """
         try:
-            vocabulary = []
-            tokens = self.tokenizer_obj.tokenize(text, self.mode)
-            
-            for token in tokens:
-                # Skip token yang bukan kata bermakna
-                if token.part_of_speech()[0] in ['補助記号', '助詞', '助動詞']:
-                    continue
-                
-                word_info = {
-                    'surface': token.surface(),  # Bentuk yang muncul di teks
-                    'base': token.dictionary_form(),  # Bentuk dasar kata
-                    'pos': token.part_of_speech()[0],  # Jenis kata
-                    'reading': token.reading_form()  # Cara baca
-                }
-                
-                # Hanya tambahkan kata yang memiliki bentuk dasar
-                if word_info['base'] and word_info['surface']:
-                    vocabulary.append(word_info)
+            with self.pool.tokenizer() as tokenizer_obj:
+                vocabulary, _ = _extract_with_tokenizer(tokenizer_obj, text)
             
             self.logger.info(f"Extracted {len(vocabulary)} vocabulary items")
             return vocabulary
@@ -65,7 +244,8 @@ class VocabularyProcessor:
             Dict[str, str]: Dictionary berisi informasi kata
         """
         try:
-            tokens = self.tokenizer_obj.tokenize(word, self.mode)
+            with self.pool.tokenizer() as tokenizer_obj:
+                tokens = tokenizer_obj.tokenize(word, self.mode)
             if tokens:
                 token = tokens[0]
                 return {
@@ -79,3 +259,64 @@ class VocabularyProcessor:
         except Exception as e:
             self.logger.error(f"Error getting word details: {str(e)}")
             raise
+
+    def extract_vocabulary_batch(self, texts: List[str], workers: Optional[int] = None,
+                                 chunksize: Optional[int] = None) -> List[List[Dict[str, str]]]:
+        """
+        Ekstrak kosakata dari banyak teks sekaligus menggunakan beberapa process
+        (mis. subtitle satu season penuh)
+        
+        Args:
+            texts (List[str]): List teks Jepang yang akan diproses
+            workers (int, optional): Jumlah worker process, default jumlah core yang
+                tersedia untuk process ini (CPU affinity)
+            chunksize (int, optional): Jumlah teks yang dikirim ke worker dalam sekali kirim,
+                default dibagi rata menjadi sekitar 4 bagian per worker
+            
+        Returns:
+            List[List[Dict[str, str]]]: List kosakata untuk setiap teks, urutan sama dengan input
+
+        Batch dengan total kurang dari MIN_PARALLEL_CHARS karakter (1 juta) diproses
+        di process sendiri, karena biaya start worker lebih besar dari tokenisasinya.
+        Worker dibuat dengan start method 'spawn', yang menjalankan ulang main module
+        di setiap worker. Karena itu process pool hanya dipakai jika dipanggil dari script
+        dengan guard `if __name__ == "__main__":`; dari dalam aplikasi Streamlit batch
+        selalu diproses di process sendiri.
+        """
+        try:
+            workers = workers or _available_cpus()
+            start = time.perf_counter()
+
+            use_pool = (
+                workers > 1
+                and sum(len(text) for text in texts) >= MIN_PARALLEL_CHARS
+                and not _running_in_streamlit()
+            )
+
+            if not use_pool:
+                workers = 1
+                with self.pool.tokenizer() as tokenizer_obj:
+                    results = [_extract_with_tokenizer(tokenizer_obj, text) for text in texts]
+            else:
+                # Chunk besar mengurangi overhead pickling antar process
+                chunksize = chunksize or max(1, len(texts) // (workers * 4))
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                ) as executor:
+                    results = list(executor.map(_extract_in_worker, texts, chunksize=chunksize))
+
+            elapsed = time.perf_counter() - start
+            token_count = sum(count for _, count in results)
+            rate = token_count / elapsed if elapsed > 0 else 0.0
+            self.logger.info(
+                f"Tokenized {len(texts)} texts ({token_count} tokens) in {elapsed:.2f}s "
+                f"({rate:.0f} tokens/s, {'process pool' if use_pool else 'in-process'}, "
+                f"{workers} workers)"
+            )
+            return [vocabulary for vocabulary, _ in results]
+            
+        except Exception as e:
+            self.logger.error(f"Error extracting vocabulary batch: {str(e)}")
+            raise
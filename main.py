@@ -32,19 +32,19 @@ def initialize_processors():
         logger.error(f"Error initializing processors: {str(e)}")
         raise
 
-def process_youtube_url(url, audio_processor):
+def process_youtube_url(url, audio_processor, start_time=None, end_time=None):
     """
     Proses URL YouTube untuk mendapatkan transkripsi
     """
     try:
-        segments = audio_processor.process_youtube_url(url)
+        segments = audio_processor.process_youtube_url(url, start_time=start_time, end_time=end_time)
         return segments
     except Exception as e:
         logger.error(f"Error processing YouTube URL: {str(e)}")
         st.error(f"Error processing YouTube URL: {str(e)}")
         return None
 
-def process_audio_file(file, audio_processor):
+def process_audio_file(file, audio_processor, start_time=None, end_time=None):
     """
     Proses file audio yang diupload untuk mendapatkan transkripsi
     """
@@ -58,7 +58,9 @@ def process_audio_file(file, audio_processor):
             f.write(file.getbuffer())
         
         # Proses file audio
-        segments = audio_processor.process_audio_file(str(temp_path))
+        segments = audio_processor.process_audio_file(
+            str(temp_path), start_time=start_time, end_time=end_time
+        )
         
         # Hapus file temporary
         os.remove(temp_path)
@@ -86,9 +88,9 @@ def create_flashcard(segment, translation, vocabulary, anki_creator):
         audio_files = anki_creator.create_audio_files(df)
         
         # Generate deck
-        output_path = anki_creator.generate_deck(df, audio_files)
+        report = anki_creator.generate_deck_streaming(df, audio_files)
         
-        return output_path
+        return report['output_path']
         
     except Exception as e:
         logger.error(f"Error creating flashcard: {str(e)}")
@@ -108,19 +110,26 @@ def main():
             ["YouTube URL", "Audio File"]
         )
         
+        # Batas waktu opsional (0 berarti tidak dibatasi)
+        with st.expander("Time range (optional)"):
+            start_input = st.number_input("Start (seconds):", min_value=0.0, value=0.0, step=1.0)
+            end_input = st.number_input("End (seconds, 0 = until end):", min_value=0.0, value=0.0, step=1.0)
+        start_time = start_input or None
+        end_time = end_input or None
+        
         segments = None
         
         if input_type == "YouTube URL":
             url = st.text_input("Enter YouTube URL:")
             if url:
                 with st.spinner("Processing YouTube video..."):
-                    segments = process_youtube_url(url, audio_processor)
+                    segments = process_youtube_url(url, audio_processor, start_time, end_time)
                     
         else:  # Audio File
             uploaded_file = st.file_uploader("Upload audio file", type=['mp3', 'wav', 'm4a'])
             if uploaded_file:
                 with st.spinner("Processing audio file..."):
-                    segments = process_audio_file(uploaded_file, audio_processor)
+                    segments = process_audio_file(uploaded_file, audio_processor, start_time, end_time)
         
         # Display results
         if segments:
@@ -180,8 +189,11 @@ def main():
                     audio_files = anki_creator.create_audio_files(df)
                     
                     # Generate deck
-                    output_path = anki_creator.generate_deck(df, audio_files)
-                    st.success(f"Complete deck created successfully! Saved to: {output_path}")
+                    report = anki_creator.generate_deck_streaming(df, audio_files)
+                    st.success(
+                        f"Complete deck created successfully! Saved to: {report['output_path']} "
+                        f"({report['package_size'] / 1024:.1f} KB, built in {report['build_time']:.2f}s)"
+                    )
                     
                 except Exception as e:
                     st.error(f"Error creating complete deck: {str(e)}")